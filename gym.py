@@ -1,14 +1,20 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import datetime
 import time
-from typing import Dict, List, Optional
+import asyncio
+import threading
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
 import google.generativeai as genai
-import os
+import hashlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from itertools import chain
+from operator import itemgetter
 
 # Page configuration
 st.set_page_config(
@@ -19,70 +25,121 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
-<style>
-    .main {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-    }
-    .stApp {
-        background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-    }
-    .workout-card {
-        background: white;
-        padding: 20px;
-        border-radius: 15px;
-        box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-        margin: 10px 0;
-        border-left: 5px solid #667eea;
-    }
-    .exercise-item {
-        background: linear-gradient(45deg, #667eea, #764ba2);
-        color: white;
-        padding: 15px;
-        border-radius: 10px;
-        margin: 5px 0;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-    }
-    .metric-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 20px;
-        border-radius: 15px;
-        text-align: center;
-        box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-    }
-    .stButton > button {
-        background: linear-gradient(45deg, #667eea, #764ba2);
-        color: white;
-        border: none;
-        border-radius: 25px;
-        padding: 0.5rem 2rem;
-        font-weight: bold;
-        transition: all 0.3s ease;
-    }
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 8px 25px rgba(102,126,234,0.3);
-    }
-    .sidebar .sidebar-content {
-        background: linear-gradient(180deg, #667eea 0%, #764ba2 100%);
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_data
+def load_css() -> str:
+    """Read the stylesheet once; it is still emitted on every rerun so styles persist"""
+    return (Path(__file__).parent / ".streamlit" / "style.css").read_text(encoding="utf-8")
+
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 # Initialize session state
 def init_session_state():
-    if 'workout_plan' not in st.session_state:
-        st.session_state.workout_plan = None
-    if 'exercises_db' not in st.session_state:
-        st.session_state.exercises_db = []
-    if 'user_profile' not in st.session_state:
-        st.session_state.user_profile = {}
+    st.session_state.update({
+        'workout_plan': None,
+        'exercises_db': [],
+        'user_profile': {},
+        '_initialized': True
+    })
 
-init_session_state()
+if '_initialized' not in st.session_state:
+    init_session_state()
 
 # API Configuration
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Shared HTTP session so connections (and TLS handshakes) are reused across reruns"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+    ))
+    return session
+
+# Fallback exercise database used when the API is unavailable
+_FALLBACK_EXERCISES = (
+    {
+        "name": "Push-ups",
+        "type": "strength",
+        "muscle": "chest",
+        "equipment": "body_only",
+        "difficulty": "beginner",
+        "instructions": "Start in plank position. Lower body until chest nearly touches floor. Push back up to start position."
+    },
+    {
+        "name": "Squats",
+        "type": "strength", 
+        "muscle": "quadriceps",
+        "equipment": "body_only",
+        "difficulty": "beginner",
+        "instructions": "Stand with feet shoulder-width apart. Lower body by bending knees and hips. Return to starting position."
+    },
+    {
+        "name": "Plank",
+        "type": "strength",
+        "muscle": "abdominals",
+        "equipment": "body_only", 
+        "difficulty": "beginner",
+        "instructions": "Hold a push-up position with forearms on ground. Keep body straight from head to heels."
+    },
+    {
+        "name": "Lunges",
+        "type": "strength",
+        "muscle": "quadriceps",
+        "equipment": "body_only",
+        "difficulty": "intermediate",
+        "instructions": "Step forward with one leg, lowering hips until both knees are bent at 90 degrees. Return to start."
+    },
+    {
+        "name": "Burpees",
+        "type": "cardio",
+        "muscle": "full_body",
+        "equipment": "body_only",
+        "difficulty": "intermediate",
+        "instructions": "From standing, drop to squat, jump back to plank, do push-up, jump forward to squat, jump up."
+    },
+    {
+        "name": "Mountain Climbers",
+        "type": "cardio",
+        "muscle": "abdominals",
+        "equipment": "body_only",
+        "difficulty": "intermediate", 
+        "instructions": "Start in plank position. Alternate bringing knees to chest in running motion."
+    },
+    {
+        "name": "Deadlifts",
+        "type": "strength",
+        "muscle": "hamstrings",
+        "equipment": "barbell",
+        "difficulty": "intermediate",
+        "instructions": "Stand with barbell at feet. Bend at hips and knees to lower bar. Stand up by extending hips and knees."
+    },
+    {
+        "name": "Pull-ups",
+        "type": "strength",
+        "muscle": "lats",
+        "equipment": "pull_up_bar",
+        "difficulty": "intermediate",
+        "instructions": "Hang from pull-up bar with palms facing away. Pull body up until chin clears bar."
+    },
+    {
+        "name": "Bicep Curls",
+        "type": "strength",
+        "muscle": "biceps",
+        "equipment": "dumbbell",
+        "difficulty": "beginner",
+        "instructions": "Hold dumbbells at sides. Curl weights up by flexing biceps. Lower slowly to start."
+    },
+    {
+        "name": "Tricep Dips",
+        "type": "strength",
+        "muscle": "triceps",
+        "equipment": "body_only",
+        "difficulty": "beginner",
+        "instructions": "Sit on chair edge, hands gripping seat. Lower body by bending arms, then push back up."
+    }
+)
+
 class ExerciseAPI:
     """Handler for exercise data from external APIs"""
     
@@ -99,7 +156,7 @@ class ExerciseAPI:
             if muscle_group:
                 params['muscle'] = muscle_group.lower()
             
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = get_http_session().get(url, headers=headers, params=params, timeout=10)
             
             if response.status_code == 200:
                 return response.json()
@@ -113,213 +170,284 @@ class ExerciseAPI:
     @staticmethod
     def get_fallback_exercises(muscle_group: str = None) -> List[Dict]:
         """Fallback exercise database when API is unavailable"""
-        exercises = [
-            {
-                "name": "Push-ups",
-                "type": "strength",
-                "muscle": "chest",
-                "equipment": "body_only",
-                "difficulty": "beginner",
-                "instructions": "Start in plank position. Lower body until chest nearly touches floor. Push back up to start position."
-            },
-            {
-                "name": "Squats",
-                "type": "strength", 
-                "muscle": "quadriceps",
-                "equipment": "body_only",
-                "difficulty": "beginner",
-                "instructions": "Stand with feet shoulder-width apart. Lower body by bending knees and hips. Return to starting position."
-            },
-            {
-                "name": "Plank",
-                "type": "strength",
-                "muscle": "abdominals",
-                "equipment": "body_only", 
-                "difficulty": "beginner",
-                "instructions": "Hold a push-up position with forearms on ground. Keep body straight from head to heels."
-            },
-            {
-                "name": "Lunges",
-                "type": "strength",
-                "muscle": "quadriceps",
-                "equipment": "body_only",
-                "difficulty": "intermediate",
-                "instructions": "Step forward with one leg, lowering hips until both knees are bent at 90 degrees. Return to start."
-            },
-            {
-                "name": "Burpees",
-                "type": "cardio",
-                "muscle": "full_body",
-                "equipment": "body_only",
-                "difficulty": "intermediate",
-                "instructions": "From standing, drop to squat, jump back to plank, do push-up, jump forward to squat, jump up."
-            },
-            {
-                "name": "Mountain Climbers",
-                "type": "cardio",
-                "muscle": "abdominals",
-                "equipment": "body_only",
-                "difficulty": "intermediate", 
-                "instructions": "Start in plank position. Alternate bringing knees to chest in running motion."
-            },
-            {
-                "name": "Deadlifts",
-                "type": "strength",
-                "muscle": "hamstrings",
-                "equipment": "barbell",
-                "difficulty": "intermediate",
-                "instructions": "Stand with barbell at feet. Bend at hips and knees to lower bar. Stand up by extending hips and knees."
-            },
-            {
-                "name": "Pull-ups",
-                "type": "strength",
-                "muscle": "lats",
-                "equipment": "pull_up_bar",
-                "difficulty": "intermediate",
-                "instructions": "Hang from pull-up bar with palms facing away. Pull body up until chin clears bar."
-            },
-            {
-                "name": "Bicep Curls",
-                "type": "strength",
-                "muscle": "biceps",
-                "equipment": "dumbbell",
-                "difficulty": "beginner",
-                "instructions": "Hold dumbbells at sides. Curl weights up by flexing biceps. Lower slowly to start."
-            },
-            {
-                "name": "Tricep Dips",
-                "type": "strength",
-                "muscle": "triceps",
-                "equipment": "body_only",
-                "difficulty": "beginner",
-                "instructions": "Sit on chair edge, hands gripping seat. Lower body by bending arms, then push back up."
-            }
-        ]
-        
         if muscle_group:
-            exercises = [ex for ex in exercises if muscle_group.lower() in ex['muscle'].lower()]
+            muscle_group = muscle_group.lower()
+            return [ex for ex in _FALLBACK_EXERCISES if muscle_group in ex['muscle']]
         
-        return exercises
+        return list(_FALLBACK_EXERCISES)
+
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Long-lived event loop for async Gemini calls.
+    
+    The SDK caches its async client globally, so every call has to run on
+    the same loop rather than a fresh one from asyncio.run().
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+async def _anext_or_none(iterator: AsyncIterator):
+    """Next item of an async iterator, or None once it is exhausted"""
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return None
+
+# Persistent cache for generated plans
+_PLAN_CACHE_DIR = Path(__file__).parent / ".cache" / "gemini"
+_PLAN_CACHE_TTL = 7 * 24 * 3600  # 7 days
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def _load_cache_entry(key: str) -> Dict:
+    """Load a cache entry from disk; raises on miss so misses are never memoized"""
+    with open(_PLAN_CACHE_DIR / f"{key}.json", encoding="utf-8") as f:
+        return json.load(f)
+
+# Structured-output schema for Gemini plans. The schema format has no
+# free-form object keys, so days come back as a list and are keyed
+# day_1..day_n after parsing.
+_EXERCISE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "name": {"type": "STRING"},
+        "sets": {"type": "INTEGER"},
+        "reps": {"type": "STRING"},
+        "rest": {"type": "STRING"},
+        "notes": {"type": "STRING"}
+    },
+    "required": ["name", "sets", "reps", "rest"]
+}
+
+_PLAN_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "plan_name": {"type": "STRING"},
+        "overview": {"type": "STRING"},
+        "weekly_schedule": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "focus": {"type": "STRING"},
+                    "exercises": {"type": "ARRAY", "items": _EXERCISE_SCHEMA}
+                },
+                "required": ["focus", "exercises"]
+            }
+        },
+        "progression_tips": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "success_tips": {"type": "ARRAY", "items": {"type": "STRING"}}
+    },
+    "required": ["plan_name", "overview", "weekly_schedule", "progression_tips", "success_tips"]
+}
+
+# Exercise fields sent to Gemini, in the column order named in the prompt
+_SUMMARY_FIELDS = itemgetter('name', 'type', 'muscle', 'difficulty', 'equipment')
+
+# (sets, reps, rest) per experience level for fallback plans
+_TRAINING_PARAMS = {
+    'beginner': (2, "8-12", "90 seconds"),
+    'intermediate': (3, "10-15", "60 seconds")
+}
+_ADVANCED_TRAINING_PARAMS = (3, "12-20", "45 seconds")
+
+# Static prompt for plan generation, filled in with str.format
+_PROMPT_TEMPLATE = """
+Create a personalized weekly workout plan based on:
+
+USER PROFILE:
+- Goal: {goal}
+- Experience Level: {experience}
+- Days per Week: {days_per_week}
+- Session Duration: {duration} minutes
+- Equipment Available: {equipment}
+- Focus Areas: {focus_areas}
+
+AVAILABLE EXERCISES (name,type,muscle,difficulty,equipment):
+{exercise_summary}
+
+Please create a structured weekly plan with:
+1. Day-by-day workout schedule (one entry per workout day) that covers every focus area
+2. Specific exercises with sets, reps, and rest periods
+3. Progression recommendations
+4. Tips for success
+"""
 
 class WorkoutAI:
     """AI-powered workout plan generator using Google Gemini"""
     
+    MODEL_NAME = 'gemini-1.5-flash'
+    GENERATION_CONFIG = {
+        "temperature": 0.7,
+        "candidate_count": 1,
+        "response_mime_type": "application/json",
+        "response_schema": _PLAN_SCHEMA
+    }
+    
     def __init__(self, api_key: str = None):
         self.api_key = api_key or st.secrets.get("GEMINI_API_KEY", "")
         if self.api_key:
             genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
+            self.model = genai.GenerativeModel(self.MODEL_NAME)
         else:
             self.model = None
     
-    def generate_workout_plan(self, user_profile: Dict, exercises: List[Dict]) -> Dict:
-        """Generate AI-powered workout plan"""
+    STREAM_CHUNK_TIMEOUT = 60  # seconds to wait for each streamed chunk
+    
+    # Output budget: fixed overhead for name/overview/tips plus room per workout day
+    BASE_OUTPUT_TOKENS = 512
+    OUTPUT_TOKENS_PER_DAY = 384
+    
+    def _generation_config(self, days_per_week: int) -> Dict:
+        """Generation config with an output cap sized to the plan length"""
+        return {
+            **self.GENERATION_CONFIG,
+            "max_output_tokens": self.BASE_OUTPUT_TOKENS + self.OUTPUT_TOKENS_PER_DAY * days_per_week
+        }
+    
+    def _cache_key(self, user_profile: Dict, exercise_summary: str, generation_config: Dict) -> str:
+        """Stable hash of everything that influences the generated plan"""
+        payload = {
+            "user_profile": user_profile,
+            "exercise_summary": exercise_summary,
+            "model": self.MODEL_NAME,
+            "generation_config": generation_config
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+    
+    @staticmethod
+    def _get_cached_plan(key: str) -> Optional[Dict]:
+        """Return a fresh cached plan, or None on miss/expiry"""
+        try:
+            entry = _load_cache_entry(key)
+        except (OSError, ValueError):
+            return None
+        
+        # Check expiry outside the memo so it can't outlive the disk TTL
+        if time.time() - entry['ts'] >= _PLAN_CACHE_TTL:
+            _load_cache_entry.clear()
+            return None
+        return entry['plan']
+    
+    @staticmethod
+    def _save_cached_plan(key: str, plan: Dict) -> None:
+        """Persist a generated plan with its timestamp"""
+        try:
+            _PLAN_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(_PLAN_CACHE_DIR / f"{key}.json", "w", encoding="utf-8") as f:
+                json.dump({"ts": time.time(), "plan": plan}, f)
+        except OSError:
+            pass
+    
+    def generate_workout_plan(self, user_profile: Dict, exercises: List[Dict],
+                              on_progress: Optional[Callable[[int], None]] = None) -> Dict:
+        """Generate AI-powered workout plan (blocking wrapper)
+        
+        on_progress is called in the calling thread with the number of
+        characters received so far while the response streams in.
+        """
         if not self.model:
             return self._generate_fallback_plan(user_profile, exercises)
         
         try:
-            # Prepare exercise data for AI
-            exercise_summary = "\n".join([
-                f"- {ex['name']}: {ex['type']} exercise for {ex['muscle']}, "
-                f"difficulty: {ex['difficulty']}, equipment: {ex['equipment']}"
-                for ex in exercises[:20]  # Limit to avoid token limits
-            ])
-            
-            prompt = f"""
-            Create a personalized weekly workout plan based on:
-            
-            USER PROFILE:
-            - Goal: {user_profile.get('goal', 'general fitness')}
-            - Experience Level: {user_profile.get('experience', 'beginner')}
-            - Days per Week: {user_profile.get('days_per_week', 3)}
-            - Session Duration: {user_profile.get('duration', 45)} minutes
-            - Equipment Available: {user_profile.get('equipment', 'bodyweight only')}
-            - Focus Areas: {user_profile.get('focus_areas', ['full body'])}
-            
-            AVAILABLE EXERCISES:
-            {exercise_summary}
-            
-            Please create a structured weekly plan with:
-            1. Day-by-day workout schedule
-            2. Specific exercises with sets, reps, and rest periods
-            3. Progression recommendations
-            4. Tips for success
-            
-            Format as JSON with this structure:
-            {{
-                "plan_name": "Personalized Plan Name",
-                "overview": "Brief description",
-                "weekly_schedule": {{
-                    "day_1": {{
-                        "focus": "muscle group focus",
-                        "exercises": [
-                            {{
-                                "name": "exercise name",
-                                "sets": 3,
-                                "reps": "12-15",
-                                "rest": "60 seconds",
-                                "notes": "form tips"
-                            }}
-                        ]
-                    }}
-                }},
-                "progression_tips": ["tip1", "tip2"],
-                "success_tips": ["tip1", "tip2"]
-            }}
+            cache_key, prompt, generation_config = self._prepare_request(user_profile, exercises)
+            cached_plan = self._get_cached_plan(cache_key)
+            if cached_plan is not None:
+                return cached_plan
             
-            Return ONLY the JSON response, no additional text or formatting.
-            """
-            
-            # Generate response with Gemini
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.7,
-                    max_output_tokens=2048,
-                    candidate_count=1
-                )
-            )
-            
-            # Parse JSON response
-            plan_text = response.text.strip()
-            
-            # Clean up response text (remove markdown formatting if present)
-            if plan_text.startswith('```json'):
-                plan_text = plan_text.replace('```json', '').replace('```', '').strip()
-            elif plan_text.startswith('```'):
-                plan_text = plan_text.replace('```', '').strip()
-            
-            # Extract JSON from response
-            start_idx = plan_text.find('{')
-            end_idx = plan_text.rfind('}') + 1
-            
-            if start_idx != -1 and end_idx != -1:
-                json_str = plan_text[start_idx:end_idx]
-                plan = json.loads(json_str)
-                return plan
-            else:
-                # If JSON parsing fails, try to parse the entire response
+            # Pull chunks through the shared loop one at a time so progress
+            # callbacks (and any UI updates they make) run in this thread
+            loop = get_event_loop()
+            stream = self._astream_text(prompt, generation_config)
+            chunks = []
+            received = 0
+            try:
+                while True:
+                    future = asyncio.run_coroutine_threadsafe(_anext_or_none(stream), loop)
+                    try:
+                        chunk = future.result(timeout=self.STREAM_CHUNK_TIMEOUT)
+                    except FutureTimeoutError:
+                        future.cancel()
+                        raise TimeoutError(
+                            f"no response chunk within {self.STREAM_CHUNK_TIMEOUT} seconds"
+                        )
+                    if chunk is None:
+                        break
+                    chunks.append(chunk)
+                    received += len(chunk)
+                    if on_progress:
+                        on_progress(received)
+            finally:
+                # Close the stream on errors or reruns so it doesn't linger on the shared loop
                 try:
-                    plan = json.loads(plan_text)
-                    return plan
-                except:
-                    return self._generate_fallback_plan(user_profile, exercises)
-                
+                    asyncio.run_coroutine_threadsafe(stream.aclose(), loop).result(
+                        timeout=self.STREAM_CHUNK_TIMEOUT
+                    )
+                except Exception:
+                    pass
+            
+            return self._parse_plan("".join(chunks), cache_key)
         except Exception as e:
             st.warning(f"AI generation error: {str(e)}")
             return self._generate_fallback_plan(user_profile, exercises)
     
+    def _prepare_request(self, user_profile: Dict, exercises: List[Dict]) -> Tuple[str, str, Dict]:
+        """Build the cache key, prompt and generation config for a plan request"""
+        # Prepare exercise data for AI as compact CSV rows
+        exercise_summary = "\n".join(
+            ",".join(map(str, _SUMMARY_FIELDS(ex)))
+            for ex in exercises[:20]  # Limit to avoid token limits
+        )
+        
+        generation_config = self._generation_config(user_profile.get('days_per_week', 3))
+        cache_key = self._cache_key(user_profile, exercise_summary, generation_config)
+        prompt = _PROMPT_TEMPLATE.format(
+            goal=user_profile.get('goal', 'general fitness'),
+            experience=user_profile.get('experience', 'beginner'),
+            days_per_week=user_profile.get('days_per_week', 3),
+            duration=user_profile.get('duration', 45),
+            equipment=', '.join(user_profile.get('equipment') or ['bodyweight only']),
+            focus_areas=', '.join(user_profile.get('focus_areas') or ['full body']),
+            exercise_summary=exercise_summary
+        )
+        return cache_key, prompt, generation_config
+    
+    async def _astream_text(self, prompt: str, generation_config: Dict) -> AsyncIterator[str]:
+        """Stream response text from Gemini; raises on API errors or truncation"""
+        response = await self.model.generate_content_async(
+            prompt,
+            stream=True,
+            generation_config=genai.types.GenerationConfig(**generation_config)
+        )
+        async for chunk in response:
+            if chunk.parts:
+                yield chunk.text
+            if chunk.candidates and chunk.candidates[0].finish_reason.name == "MAX_TOKENS":
+                raise ValueError(
+                    f"response truncated at {generation_config['max_output_tokens']} output tokens"
+                )
+    
+    def _parse_plan(self, plan_text: str, cache_key: str) -> Dict:
+        """Parse and cache a structured-output plan"""
+        # Gemini returns schema-conforming JSON directly
+        plan = json.loads(plan_text)
+        plan['weekly_schedule'] = {
+            f"day_{i}": day for i, day in enumerate(plan['weekly_schedule'], start=1)
+        }
+        self._save_cached_plan(cache_key, plan)
+        return plan
+    
     def _generate_fallback_plan(self, user_profile: Dict, exercises: List[Dict]) -> Dict:
         """Generate a basic workout plan when AI is unavailable"""
         days_per_week = user_profile.get('days_per_week', 3)
         experience = user_profile.get('experience', 'beginner')
         goal = user_profile.get('goal', 'general_fitness')
         
-        # Filter exercises by difficulty
-        suitable_exercises = [
-            ex for ex in exercises 
-            if ex['difficulty'] == experience or experience == 'advanced'
-        ]
+        # Filter exercises by difficulty (advanced users can do everything)
+        if experience == 'advanced':
+            suitable_exercises = exercises
+        else:
+            suitable_exercises = [ex for ex in exercises if ex['difficulty'] == experience]
         
         if not suitable_exercises:
             suitable_exercises = exercises
@@ -342,17 +470,12 @@ class WorkoutAI:
             ]
         }
         
+        # Day-invariant exercise selection and training parameters
+        selected_exercises = suitable_exercises[:4]  # Select first 4 exercises
+        sets, reps, rest = _TRAINING_PARAMS.get(experience, _ADVANCED_TRAINING_PARAMS)
+        
         # Generate daily workouts
         for day in range(1, days_per_week + 1):
-            selected_exercises = suitable_exercises[:4]  # Select first 4 exercises
-            
-            if experience == 'beginner':
-                sets, reps, rest = 2, "8-12", "90 seconds"
-            elif experience == 'intermediate':
-                sets, reps, rest = 3, "10-15", "60 seconds"
-            else:
-                sets, reps, rest = 3, "12-20", "45 seconds"
-            
             plan["weekly_schedule"][f"day_{day}"] = {
                 "focus": "Full Body" if day <= 3 else "Active Recovery",
                 "exercises": [
@@ -369,6 +492,11 @@ class WorkoutAI:
         
         return plan
 
+@st.cache_resource
+def get_workout_ai() -> WorkoutAI:
+    """Shared WorkoutAI instance reused across reruns and sessions"""
+    return WorkoutAI()
+
 # Main App Interface
 def main():
     st.title(" AI-Powered Workout Routine Builder")
@@ -447,17 +575,21 @@ def main():
                 
                 # Get exercises for focus areas
                 all_exercises = []
-                for focus in focus_areas:
-                    exercises = ExerciseAPI.fetch_exercises_ninja_api(focus)
-                    all_exercises.extend(exercises)
+                if focus_areas:
+                    # Workers share this script run's context so API warnings still render
+                    ctx = get_script_run_ctx()
+                    with ThreadPoolExecutor(
+                        max_workers=min(8, len(focus_areas)),
+                        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+                    ) as executor:
+                        results = executor.map(ExerciseAPI.fetch_exercises_ninja_api, focus_areas)
+                        all_exercises = list(chain.from_iterable(results))
                 
-                # Remove duplicates
-                seen_names = set()
-                unique_exercises = []
+                # Remove duplicates, keeping the first occurrence of each name
+                unique_by_name = {}
                 for ex in all_exercises:
-                    if ex['name'] not in seen_names:
-                        unique_exercises.append(ex)
-                        seen_names.add(ex['name'])
+                    unique_by_name.setdefault(ex['name'], ex)
+                unique_exercises = list(unique_by_name.values())
                 
                 st.session_state.exercises_db = unique_exercises
                 
@@ -465,16 +597,19 @@ def main():
                 progress_bar.progress(75)
                 
                 # Generate workout plan
-                workout_ai = WorkoutAI()
-                plan = workout_ai.generate_workout_plan(st.session_state.user_profile, unique_exercises)
+                workout_ai = get_workout_ai()
+                plan = workout_ai.generate_workout_plan(
+                    st.session_state.user_profile,
+                    unique_exercises,
+                    on_progress=lambda received: status_text.text(
+                        f"Generating AI-powered workout plan... ({received} characters received)"
+                    )
+                )
                 st.session_state.workout_plan = plan
                 
-                status_text.text("Workout plan generated successfully!")
-                progress_bar.progress(100)
-                time.sleep(1)
-                
                 progress_bar.empty()
                 status_text.empty()
+                st.toast("Workout plan generated!", icon="✅")
     
     # Display workout plan
     if st.session_state.workout_plan:
@@ -492,31 +627,31 @@ def main():
             with day_tabs[i]:
                 st.markdown(f"###  Focus: {day_data['focus']}")
                 
-                for j, exercise in enumerate(day_data['exercises']):
-                    st.markdown(f"""
-                    <div class="exercise-item">
-                        <h4>{j+1}. {exercise['name']}</h4>
+                # Render all exercises for the day in a single markdown call
+                exercise_html = "".join(
+                    f"""<div class="exercise-item">
+                        <h4>{j}. {exercise['name']}</h4>
                         <div style="display: flex; gap: 20px; margin-top: 10px;">
                             <span><strong>Sets:</strong> {exercise['sets']}</span>
                             <span><strong>Reps:</strong> {exercise['reps']}</span>
                             <span><strong>Rest:</strong> {exercise['rest']}</span>
                         </div>
                         <p style="margin-top: 10px; font-style: italic;">{exercise.get('notes', '')}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    </div>"""
+                    for j, exercise in enumerate(day_data['exercises'], start=1)
+                )
+                st.markdown(exercise_html, unsafe_allow_html=True)
         
         # Tips and progression
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("###  Progression Tips")
-            for tip in plan.get('progression_tips', []):
-                st.markdown(f"• {tip}")
+            st.markdown("\n".join(f"- {tip}" for tip in plan.get('progression_tips', [])))
         
         with col2:
             st.markdown("###  Success Tips")
-            for tip in plan.get('success_tips', []):
-                st.markdown(f"• {tip}")
+            st.markdown("\n".join(f"- {tip}" for tip in plan.get('success_tips', [])))
         
         # Export options
         st.markdown("###  Export Your Plan")